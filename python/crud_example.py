@@ -1,18 +1,142 @@
+import queue
 import sqlite3
+import threading
 from contextlib import contextmanager
 
+class ConnectionPool:
+    """Fixed-size pool of sqlite3 connections, opened on first use.
+
+    Connections are reused across calls, so each keeps its statement cache
+    warm. Nested ``connection()`` calls on one thread share a connection,
+    which lets inner calls join an outer transaction. Use the pool as a
+    context manager, or call ``close()``, to release its connections.
+    """
+    
+    def __init__(self, database, pool_size=4):
+        if str(database) in (':memory:', ''):
+            # Each connection would open its own private, empty database.
+            raise ValueError('ConnectionPool needs a database file, not an in-memory database')
+        self.database = database
+        self.pool_size = pool_size
+        # LIFO hands out the most recently used (warmest) connection first.
+        self._idle = queue.LifoQueue(maxsize=pool_size)
+        self._opened = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+    
+    def _open(self):
+        conn = sqlite3.connect(self.database, isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        # WAL lets readers run alongside a writer and turns commits into journal
+        # appends; synchronous=NORMAL is still crash-safe in WAL mode. Use FULL
+        # if every commit must survive power loss.
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA mmap_size=268435456')
+        conn.execute('PRAGMA cache_size=-65536')
+        return conn
+    
+    def _checkout(self):
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError('Cannot operate on a closed pool.')
+            if self._idle.empty() and self._opened < self.pool_size:
+                self._opened += 1
+                return self._open()
+        return self._idle.get()
+    
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of the block."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            yield conn
+            return
+        conn = self._checkout()
+        self._local.conn = conn
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            with self._lock:
+                if self._closed:
+                    conn.close()
+                    self._opened -= 1
+                    return
+            self._idle.put(conn)
+    
+    def close(self):
+        """Close idle connections; connections in use close when returned."""
+        with self._lock:
+            self._closed = True
+            while not self._idle.empty():
+                self._idle.get_nowait().close()
+                self._opened -= 1
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+def connect(database='tasks.db', pool_size=4):
+    """Create a connection pool for the given database.
+
+    Every pooled connection opens ``database`` separately, so it must be a
+    file path; for tests, use a file in a temporary directory.
+    """
+    return ConnectionPool(database, pool_size)
+
+_POOL = connect()
+
+def set_pool(pool):
+    """Make the CRUD functions use ``pool``; returns the previous pool."""
+    global _POOL
+    previous, _POOL = _POOL, pool
+    return previous
+
+_INSERT_SQL = 'INSERT INTO tasks (title) VALUES (?)'
+_SELECT_ALL_SQL = 'SELECT id, title, completed FROM tasks'
+_SELECT_ONE_SQL = 'SELECT id, title, completed FROM tasks WHERE id = ?'
+_DELETE_SQL = 'DELETE FROM tasks WHERE id = ?'
+# Keyed by (title given, completed given).
+_UPDATE_SQL = {
+    (True, False): 'UPDATE tasks SET title = ? WHERE id = ?',
+    (False, True): 'UPDATE tasks SET completed = ? WHERE id = ?',
+    (True, True): 'UPDATE tasks SET title = ?, completed = ? WHERE id = ?',
+}
+
 @contextmanager
 def get_db():
-    conn = sqlite3.connect('tasks.db')
-    conn.row_factory = sqlite3.Row
-    try:
+    with _POOL.connection() as conn:
+        if conn.in_transaction:
+            # Already inside an outer transaction; let it commit or roll back.
+            yield conn
+            return
+        conn.execute('BEGIN')
+        try:
+            yield conn
+            conn.execute('COMMIT')
+        except BaseException:
+            # Includes KeyboardInterrupt: a transaction left open here would
+            # be silently joined, and never committed, by the next caller.
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+
+@contextmanager
+def bulk():
+    """Group several mutations into one transaction (and one fsync).
+
+    Callers doing more than one create/update/delete should wrap them in
+    ``with bulk():``; the individual calls join the open transaction.
+    """
+    with get_db() as conn:
         yield conn
-        conn.commit()
-    except Exception:
-        conn.rollback()
-        raise
-    finally:
-        conn.close()
 
 def init_db():
     with get_db() as conn:
@@ -27,41 +151,49 @@ def init_db():
 # CREATE
 def create_task(title):
     with get_db() as conn:
-        cursor = conn.execute('INSERT INTO tasks (title) VALUES (?)', (title,))
+        cursor = conn.execute(_INSERT_SQL, (title,))
         return cursor.lastrowid
 
+def create_tasks(titles):
+    with bulk() as conn:
+        conn.executemany(_INSERT_SQL, [(title,) for title in titles])
+
 # READ
+def iter_tasks():
+    """Yield tasks one at a time instead of building the full list."""
+    # A plain SELECT needs no explicit transaction, and not opening one means
+    # a partially consumed generator cannot leave a transaction dangling;
+    # the connection goes back to the pool when the generator is closed.
+    with _POOL.connection() as conn:
+        for row in conn.execute(_SELECT_ALL_SQL):
+            yield dict(row)
+
 def get_all_tasks():
-    with get_db() as conn:
-        return [dict(row) for row in conn.execute('SELECT * FROM tasks')]
+    return list(iter_tasks())
 
 def get_task(task_id):
     with get_db() as conn:
-        row = conn.execute('SELECT * FROM tasks WHERE id = ?', (task_id,)).fetchone()
+        row = conn.execute(_SELECT_ONE_SQL, (task_id,)).fetchone()
         return dict(row) if row else None
 
 # UPDATE
 def update_task(task_id, title=None, completed=None):
-    updates = []
-    params = []
-    if title is not None:
-        updates.append('title = ?')
-        params.append(title)
-    if completed is not None:
-        updates.append('completed = ?')
-        params.append(completed)
-    if not updates:
+    key = (title is not None, completed is not None)
+    if key == (False, False):
         return False
-    params.append(task_id)
+    if key == (True, True):
+        params = (title, completed, task_id)
+    else:
+        params = (title if key[0] else completed, task_id)
     with get_db() as conn:
-        conn.execute(f'UPDATE tasks SET {", ".join(updates)} WHERE id = ?', params)
-        return conn.total_changes > 0
+        cursor = conn.execute(_UPDATE_SQL[key], params)
+        return cursor.rowcount > 0
 
 # DELETE
 def delete_task(task_id):
     with get_db() as conn:
-        conn.execute('DELETE FROM tasks WHERE id = ?', (task_id,))
-        return conn.total_changes > 0
+        cursor = conn.execute(_DELETE_SQL, (task_id,))
+        return cursor.rowcount > 0
 
 # Example usage
 if __name__ == '__main__':
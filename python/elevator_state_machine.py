@@ -3,15 +3,23 @@
 Minimal elevator state machine implementation.
 """
 
+import io
+import logging
+import sys
 from enum import Enum
 from typing import Optional
 
-class State(Enum):
+logger = logging.getLogger(__name__)
+
+class State(str, Enum):
     """Elevator states."""
     IDLE = "idle"
     MOVING_UP = "moving_up"
     MOVING_DOWN = "moving_down"
     DOORS_OPEN = "doors_open"
+    
+    # Members are their own value string, so formatting needs no .value lookup.
+    __str__ = str.__str__
 
 class Elevator:
     """Elevator with state machine."""
@@ -43,20 +51,30 @@ class Elevator:
         
         return True
     
+    def _move_up(self):
+        if self.current_floor < self.target_floor:
+            self.current_floor += 1
+            if self.current_floor == self.target_floor:
+                self.state = State.DOORS_OPEN
+                self.target_floor = None
+    
+    def _move_down(self):
+        if self.current_floor > self.target_floor:
+            self.current_floor -= 1
+            if self.current_floor == self.target_floor:
+                self.state = State.DOORS_OPEN
+                self.target_floor = None
+    
+    _MOVE_HANDLERS = {
+        State.MOVING_UP: _move_up,
+        State.MOVING_DOWN: _move_down,
+    }
+    
     def move(self):
         """Move elevator one floor based on current state."""
-        if self.state == State.MOVING_UP:
-            if self.current_floor < self.target_floor:
-                self.current_floor += 1
-                if self.current_floor == self.target_floor:
-                    self.state = State.DOORS_OPEN
-                    self.target_floor = None
-        elif self.state == State.MOVING_DOWN:
-            if self.current_floor > self.target_floor:
-                self.current_floor -= 1
-                if self.current_floor == self.target_floor:
-                    self.state = State.DOORS_OPEN
-                    self.target_floor = None
+        handler = self._MOVE_HANDLERS.get(self.state)
+        if handler is not None:
+            handler(self)
     
     def close_doors(self):
         """Close doors and return to idle."""
@@ -65,39 +83,66 @@ class Elevator:
     
     def get_status(self) -> str:
         """Get current status string."""
-        status = f"Floor {self.current_floor}, State: {self.state.value}"
+        status = f"Floor {self.current_floor}, State: {self.state}"
         if self.target_floor:
             status += f", Target: {self.target_floor}"
         return status
 
 def main():
     """Example usage."""
+    # Buffer the step-by-step trace and write it out in one go at the end
+    # rather than issuing a write per simulation step.
+    buffer = io.StringIO()
+    handler = logging.StreamHandler(buffer)
+    old_level, old_propagate = logger.level, logger.propagate
+    logger.addHandler(handler)
+    # Respect a level the caller already chose (e.g. WARNING to silence it).
+    if logger.level == logging.NOTSET:
+        logger.setLevel(logging.INFO)
+    # Keep the trace out of any root handlers the embedding program set up,
+    # which would otherwise print every step a second time, unbuffered.
+    logger.propagate = False
+    try:
+        _simulate()
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(old_level)
+        logger.propagate = old_propagate
+        sys.stdout.write(buffer.getvalue())
+
+def _log_status(elevator):
+    """Log the elevator status, building it only if INFO is enabled."""
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("  %s", elevator.get_status())
+
+def _simulate():
+    """Drive the elevator through two requests, logging each step."""
     elevator = Elevator(floors=5)
     
-    print("Initial state:")
-    print(f"  {elevator.get_status()}")
+    logger.info("Initial state:")
+    _log_status(elevator)
     
-    print("\nRequesting floor 3:")
+    logger.info("\nRequesting floor 3:")
     elevator.request_floor(3)
-    print(f"  {elevator.get_status()}")
+    _log_status(elevator)
     
-    print("\nMoving...")
+    logger.info("\nMoving...")
     while elevator.state != State.DOORS_OPEN:
         elevator.move()
-        print(f"  {elevator.get_status()}")
+        _log_status(elevator)
     
-    print("\nClosing doors:")
+    logger.info("\nClosing doors:")
     elevator.close_doors()
-    print(f"  {elevator.get_status()}")
+    _log_status(elevator)
     
-    print("\nRequesting floor 1:")
+    logger.info("\nRequesting floor 1:")
     elevator.request_floor(1)
-    print(f"  {elevator.get_status()}")
+    _log_status(elevator)
     
-    print("\nMoving...")
+    logger.info("\nMoving...")
     while elevator.state != State.DOORS_OPEN:
         elevator.move()
-        print(f"  {elevator.get_status()}")
+        _log_status(elevator)
 
 if __name__ == '__main__':
     main()
@@ -4,10 +4,21 @@ Minimal image fetcher with LRU caching.
 """
 
 import hashlib
+import logging
+import shutil
+import sys
+import threading
 import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Prefix for cache filenames; bump when the URL hashing scheme changes.
+HASH_VERSION = "v2"
 
 class ImageCache:
     """Image cache with LRU eviction policy."""
@@ -16,27 +27,54 @@ class ImageCache:
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
         self.max_size = max_size
+        # In-memory index of cached files, oldest first; seeded from the
+        # directory once so fetches don't have to rescan it.
+        files = sorted((f.stat().st_mtime, f) for f in self.cache_dir.glob("*") if f.is_file())
+        self._lru = OrderedDict((f, None) for _, f in files)
+        # Guards _lru; downloads themselves run outside the lock.
+        self._lock = threading.Lock()
         # Create cached method with dynamic maxsize
         self._get_cached = lru_cache(maxsize=max_size)(self._get_impl)
     
     def _url_to_filename(self, url: str) -> str:
         """Convert URL to cache filename."""
-        url_hash = hashlib.md5(url.encode()).hexdigest()
+        url_hash = hashlib.sha256(url.encode()).hexdigest()[:32]
+        extension = Path(url).suffix or '.jpg'
+        return f"{HASH_VERSION}-{url_hash}{extension}"
+    
+    def _legacy_filename(self, url: str) -> str:
+        """Filename used by the unversioned MD5 scheme."""
+        url_hash = hashlib.md5(url.encode(), usedforsecurity=False).hexdigest()
         extension = Path(url).suffix or '.jpg'
         return f"{url_hash}{extension}"
     
     def _get_cache_path(self, url: str) -> Path:
-        """Get cache file path for URL."""
-        return self.cache_dir / self._url_to_filename(url)
+        """Get cache file path for URL, migrating a legacy entry if present."""
+        cache_path = self.cache_dir / self._url_to_filename(url)
+        if not cache_path.exists():
+            legacy_path = self.cache_dir / self._legacy_filename(url)
+            with self._lock:
+                if legacy_path.exists():
+                    try:
+                        legacy_path.replace(cache_path)
+                    except FileNotFoundError:
+                        pass  # another process migrated it first
+                    # Re-key the index entry so the file isn't counted twice.
+                    self._lru.pop(legacy_path, None)
+                    self._lru[cache_path] = None
+        return cache_path
+    
+    def _touch(self, cache_path: Path):
+        """Mark cache file as most recently used."""
+        self._lru[cache_path] = None
+        self._lru.move_to_end(cache_path)
     
     def _evict_oldest_file(self):
-        """Evict oldest file from cache directory when max size exceeded."""
-        files = [(f.stat().st_mtime, f) for f in self.cache_dir.glob("*") if f.is_file()]
-        if len(files) > self.max_size:
-            files.sort()
-            oldest_file = files[0][1]
-            oldest_file.unlink()
-            print(f"Evicted LRU file: {oldest_file}")
+        """Evict oldest files from cache directory when max size exceeded."""
+        while len(self._lru) > self.max_size:
+            oldest_file, _ = self._lru.popitem(last=False)
+            oldest_file.unlink(missing_ok=True)
+            logger.info("Evicted LRU file: %s", oldest_file)
     
     def is_cached(self, url: str) -> bool:
         """Check if image is already cached."""
@@ -47,7 +85,9 @@ class ImageCache:
         cache_path = self._get_cache_path(url)
         
         if cache_path.exists():
-            print(f"Using cached image: {cache_path}")
+            with self._lock:
+                self._touch(cache_path)
+            logger.info("Using cached image: %s", cache_path)
             return cache_path
         
         return self._fetch_impl(url)
@@ -56,22 +96,30 @@ class ImageCache:
         """Internal implementation for fetching image."""
         cache_path = self._get_cache_path(url)
         
-        # Evict oldest file if cache is full
-        self._evict_oldest_file()
-        
         try:
-            print(f"Fetching image from: {url}")
+            logger.info("Fetching image from: %s", url)
             with urllib.request.urlopen(url, timeout=10) as response:
                 if response.status == 200:
-                    data = response.read()
-                    cache_path.write_bytes(data)
-                    print(f"Cached image: {cache_path} ({len(data)} bytes)")
+                    # Stream to a temp file so a failed download never
+                    # leaves a truncated image at the cache path.
+                    tmp_path = cache_path.with_name(f"{cache_path.name}.{threading.get_ident()}.part")
+                    try:
+                        with open(tmp_path, 'wb') as f:
+                            shutil.copyfileobj(response, f, 1 << 20)
+                        tmp_path.replace(cache_path)
+                    finally:
+                        tmp_path.unlink(missing_ok=True)
+                    size = cache_path.stat().st_size
+                    with self._lock:
+                        self._touch(cache_path)
+                        self._evict_oldest_file()
+                    logger.info("Cached image: %s (%s bytes)", cache_path, size)
                     return cache_path
                 else:
-                    print(f"Error: HTTP {response.status}")
+                    logger.error("Error: HTTP %s", response.status)
                     return None
         except Exception as e:
-            print(f"Error fetching image: {e}")
+            logger.error("Error fetching image: %s", e)
             return None
     
     def fetch(self, url: str, force_refresh: bool = False) -> Optional[Path]:
@@ -86,16 +134,24 @@ class ImageCache:
         """Get image path (from cache or fetch)."""
         return self._get_cached(url)
     
+    def get_many(self, urls: List[str], max_workers: int = 8) -> List[Optional[Path]]:
+        """Get several images, fetching uncached ones concurrently."""
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.get, urls))
+    
     def clear(self):
         """Clear all cached images."""
         for file in self.cache_dir.glob("*"):
             if file.is_file():
                 file.unlink()
+        with self._lock:
+            self._lru.clear()
         self._get_cached.cache_clear()
-        print(f"Cleared cache directory: {self.cache_dir}")
+        logger.info("Cleared cache directory: %s", self.cache_dir)
 
 def main():
     """Example usage."""
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
     cache = ImageCache(max_size=3)
     
     test_urls = [
@@ -105,11 +161,10 @@ def main():
         "https://httpbin.org/image/svg",
     ]
     
-    print("Fetching images (cache size: 3)...")
-    for url in test_urls:
-        image_path = cache.get(url)
+    print("Fetching images concurrently (cache size: 3)...")
+    for image_path in cache.get_many(test_urls):
         if image_path:
-            print(f"  Image saved to: {image_path}\n")
+            print(f"  Image saved to: {image_path}")
     
     print("\nFetching first image again (should be in cache)...")
     image_path = cache.get(test_urls[0])
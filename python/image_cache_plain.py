@@ -4,10 +4,20 @@ Minimal image fetcher with LRU caching.
 """
 
 import hashlib
+import logging
+import shutil
+import sys
+import threading
 import urllib.request
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Prefix for cache filenames; bump when the URL hashing scheme changes.
+HASH_VERSION = "v2"
 
 class ImageCache:
     """Image cache with LRU eviction policy."""
@@ -17,25 +27,41 @@ class ImageCache:
         self.cache_dir.mkdir(exist_ok=True)
         self.max_size = max_size
         self.lru_cache = OrderedDict()
+        # Guards lru_cache; downloads themselves run outside the lock.
+        self._lock = threading.Lock()
     
     def _url_to_filename(self, url: str) -> str:
         """Convert URL to cache filename."""
-        url_hash = hashlib.md5(url.encode()).hexdigest()
+        url_hash = hashlib.sha256(url.encode()).hexdigest()[:32]
+        extension = Path(url).suffix or '.jpg'
+        return f"{HASH_VERSION}-{url_hash}{extension}"
+    
+    def _legacy_filename(self, url: str) -> str:
+        """Filename used by the unversioned MD5 scheme."""
+        url_hash = hashlib.md5(url.encode(), usedforsecurity=False).hexdigest()
         extension = Path(url).suffix or '.jpg'
         return f"{url_hash}{extension}"
     
     def _get_cache_path(self, url: str) -> Path:
-        """Get cache file path for URL."""
-        return self.cache_dir / self._url_to_filename(url)
+        """Get cache file path for URL, migrating a legacy entry if present."""
+        cache_path = self.cache_dir / self._url_to_filename(url)
+        if not cache_path.exists():
+            legacy_path = self.cache_dir / self._legacy_filename(url)
+            with self._lock:
+                if legacy_path.exists():
+                    try:
+                        legacy_path.replace(cache_path)
+                    except FileNotFoundError:
+                        pass  # another process migrated it first
+        return cache_path
     
     def _evict_lru(self):
         """Evict least recently used item from cache."""
         if self.lru_cache:
-            lru_url, _ = self.lru_cache.popitem(last=False)
-            cache_path = self._get_cache_path(lru_url)
+            lru_url, cache_path = self.lru_cache.popitem(last=False)
             if cache_path.exists():
                 cache_path.unlink()
-            print(f"Evicted LRU: {lru_url}")
+            logger.info("Evicted LRU: %s", lru_url)
     
     def _touch(self, url: str):
         """Move URL to end (most recently used)."""
@@ -51,28 +77,39 @@ class ImageCache:
         cache_path = self._get_cache_path(url)
         
         if not force_refresh and cache_path.exists():
-            self._touch(url)
-            print(f"Using cached image: {cache_path}")
+            with self._lock:
+                self._touch(url)
+            logger.info("Using cached image: %s", cache_path)
             return cache_path
         
-        while len(self.lru_cache) >= self.max_size:
-            self._evict_lru()
-        
         try:
-            print(f"Fetching image from: {url}")
+            logger.info("Fetching image from: %s", url)
             with urllib.request.urlopen(url, timeout=10) as response:
                 if response.status == 200:
-                    data = response.read()
-                    cache_path.write_bytes(data)
-                    self.lru_cache[url] = cache_path
-                    self._touch(url)
-                    print(f"Cached image: {cache_path} ({len(data)} bytes)")
+                    # Stream to a temp file so a failed download never
+                    # leaves a truncated image at the cache path.
+                    tmp_path = cache_path.with_name(f"{cache_path.name}.{threading.get_ident()}.part")
+                    try:
+                        with open(tmp_path, 'wb') as f:
+                            shutil.copyfileobj(response, f, 1 << 20)
+                        tmp_path.replace(cache_path)
+                    finally:
+                        tmp_path.unlink(missing_ok=True)
+                    size = cache_path.stat().st_size
+                    with self._lock:
+                        self.lru_cache[url] = cache_path
+                        self._touch(url)
+                        # Evict after inserting so concurrent fetches can't
+                        # overshoot max_size.
+                        while len(self.lru_cache) > self.max_size:
+                            self._evict_lru()
+                    logger.info("Cached image: %s (%s bytes)", cache_path, size)
                     return cache_path
                 else:
-                    print(f"Error: HTTP {response.status}")
+                    logger.error("Error: HTTP %s", response.status)
                     return None
         except Exception as e:
-            print(f"Error fetching image: {e}")
+            logger.error("Error fetching image: %s", e)
             return None
     
     def get(self, url: str) -> Optional[Path]:
@@ -80,24 +117,32 @@ class ImageCache:
         cache_path = self._get_cache_path(url)
         
         if cache_path.exists():
-            # Add to LRU cache if not already tracked
-            if url not in self.lru_cache:
-                self.lru_cache[url] = cache_path
-            self._touch(url)
+            with self._lock:
+                # Add to LRU cache if not already tracked
+                if url not in self.lru_cache:
+                    self.lru_cache[url] = cache_path
+                self._touch(url)
             return cache_path
         
         return self.fetch(url)
     
+    def get_many(self, urls: List[str], max_workers: int = 8) -> List[Optional[Path]]:
+        """Get several images, fetching uncached ones concurrently."""
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.get, urls))
+    
     def clear(self):
         """Clear all cached images."""
         for file in self.cache_dir.glob("*"):
             if file.is_file():
                 file.unlink()
-        self.lru_cache.clear()
-        print(f"Cleared cache directory: {self.cache_dir}")
+        with self._lock:
+            self.lru_cache.clear()
+        logger.info("Cleared cache directory: %s", self.cache_dir)
 
 def main():
     """Example usage."""
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
     cache = ImageCache(max_size=3)
     
     test_urls = [
@@ -107,11 +152,10 @@ def main():
         "https://httpbin.org/image/svg",
     ]
     
-    print("Fetching images (cache size: 3)...")
-    for url in test_urls:
-        image_path = cache.get(url)
+    print("Fetching images concurrently (cache size: 3)...")
+    for image_path in cache.get_many(test_urls):
         if image_path:
-            print(f"  Image saved to: {image_path}\n")
+            print(f"  Image saved to: {image_path}")
     
     print("\nFetching first image again (should be in cache)...")
     image_path = cache.get(test_urls[0])
@@ -6,44 +6,146 @@ Demonstrates CRUD operations for books with command-line interface.
 import argparse
 import json
 import os
+import sqlite3
+from contextlib import contextmanager
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional, faster parser for the legacy import
+    orjson = None
+
+DB_FILE = Path.home() / '.library_data.db'
+# Legacy JSON store; imported into the database once, on first run.
 DATA_FILE = Path.home() / '.library_data.json'
 
+_conn = None
+
+def _connection():
+    """Return the shared connection, opening it on first use."""
+    # One command runs per process, so a single reused connection is all the
+    # CLI needs; crud_example.ConnectionPool covers multi-threaded callers.
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(DB_FILE, isolation_level=None)
+        _conn.row_factory = sqlite3.Row
+    return _conn
+
+@contextmanager
+def get_db(immediate=False):
+    """Run the enclosed statements in a single transaction.
+
+    Pass ``immediate=True`` when the block writes: it takes the write lock
+    up front, because a deferred transaction that reads a row and then
+    writes it fails its lock upgrade with "database is locked" instead of
+    waiting out the busy timeout.
+    """
+    conn = _connection()
+    if conn.in_transaction:
+        yield conn
+        return
+    conn.execute('BEGIN IMMEDIATE' if immediate else 'BEGIN')
+    try:
+        yield conn
+        conn.execute('COMMIT')
+    except BaseException:
+        # Includes KeyboardInterrupt: a transaction left open here would be
+        # silently joined, and never committed, by the next caller.
+        if conn.in_transaction:
+            conn.execute('ROLLBACK')
+        raise
+
 def load_data():
-    """Load library data from JSON file."""
+    """Load library data from the legacy JSON file."""
     if DATA_FILE.exists():
+        if orjson is not None:
+            return orjson.loads(DATA_FILE.read_bytes())
         with open(DATA_FILE, 'r') as f:
             return json.load(f)
     return {'books': [], 'borrowed': {}}
 
-def save_data(data):
-    """Save library data to JSON file."""
-    with open(DATA_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+def _search_key(title, author):
+    """Casefolded title and author, matched by search_books without re-lowering."""
+    return f'{title}\0{author}'.casefold()
+
+def init_db():
+    """Create the books table, importing the legacy JSON store if present."""
+    # Already set up (see user_version below): skip the write transaction so
+    # read-only commands don't queue behind writers.
+    if _connection().execute('PRAGMA user_version').fetchone()[0] >= 2:
+        return
+    with get_db(immediate=True) as conn:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS books (
+                id INTEGER PRIMARY KEY,
+                title TEXT NOT NULL,
+                author TEXT NOT NULL,
+                isbn TEXT,
+                available INTEGER NOT NULL DEFAULT 1,
+                borrower TEXT,
+                search_key TEXT NOT NULL DEFAULT ''
+            )
+        ''')
+        # user_version records which setup steps have run: 1 = the one-time
+        # JSON import (so an emptied library is not refilled from the old
+        # file), 2 = search_key populated.
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        if version < 1:
+            data = load_data()
+            # The JSON store assigned ids as len(books) + 1, which repeats
+            # after a removal; index by id and let repeats get fresh ids.
+            by_id = {}
+            duplicates = []
+            for book in data['books']:
+                if book['id'] in by_id:
+                    duplicates.append(book)
+                else:
+                    by_id[book['id']] = book
+            conn.executemany(
+                'INSERT INTO books (id, title, author, isbn, available, borrower) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                [(b['id'], b['title'], b['author'], b['isbn'], b['available'],
+                  data['borrowed'].get(str(b['id'])))
+                 for b in by_id.values()]
+            )
+            conn.executemany(
+                'INSERT INTO books (title, author, isbn, available) VALUES (?, ?, ?, ?)',
+                [(b['title'], b['author'], b['isbn'], b['available']) for b in duplicates]
+            )
+        if version < 2:
+            if version == 1:
+                conn.execute("ALTER TABLE books ADD COLUMN search_key TEXT NOT NULL DEFAULT ''")
+            conn.executemany(
+                'UPDATE books SET search_key = ? WHERE id = ?',
+                [(_search_key(title, author), book_id) for book_id, title, author
+                 in conn.execute('SELECT id, title, author FROM books').fetchall()]
+            )
+            conn.execute('PRAGMA user_version = 2')
+
+def _get_book(conn, book_id):
+    """Look up a book by id via the primary key."""
+    return conn.execute('SELECT * FROM books WHERE id = ?', (book_id,)).fetchone()
 
 def add_book(title, author, isbn=None):
     """Add a new book to the library."""
-    data = load_data()
-    book = {
-        'id': len(data['books']) + 1,
-        'title': title,
-        'author': author,
-        'isbn': isbn or f'ISBN-{len(data["books"]) + 1:04d}',
-        'available': True
-    }
-    data['books'].append(book)
-    save_data(data)
-    print(f"Added book: {title} by {author} (ID: {book['id']})")
-    return book['id']
+    with get_db(immediate=True) as conn:
+        book_id = conn.execute(
+            'INSERT INTO books (title, author, isbn, search_key) VALUES (?, ?, ?, ?)',
+            (title, author, isbn, _search_key(title, author))
+        ).lastrowid
+        if not isbn:
+            conn.execute('UPDATE books SET isbn = ? WHERE id = ?',
+                         (f'ISBN-{book_id:04d}', book_id))
+    print(f"Added book: {title} by {author} (ID: {book_id})")
+    return book_id
 
 def list_books(available_only=False):
     """List all books in the library."""
-    data = load_data()
-    books = data['books']
-    
+    conn = _connection()
     if available_only:
-        books = [b for b in books if b['available']]
+        books = conn.execute('SELECT * FROM books WHERE available ORDER BY id').fetchall()
+    else:
+        books = conn.execute('SELECT * FROM books ORDER BY id').fetchall()
     
     if not books:
         print("No books found.")
@@ -58,65 +160,60 @@ def list_books(available_only=False):
 
 def borrow_book(book_id, borrower):
     """Borrow a book from the library."""
-    data = load_data()
-    book = next((b for b in data['books'] if b['id'] == book_id), None)
-    
-    if not book:
-        print(f"Error: Book with ID {book_id} not found.")
-        return
-    
-    if not book['available']:
-        print(f"Error: Book '{book['title']}' is already borrowed.")
-        return
-    
-    book['available'] = False
-    data['borrowed'][str(book_id)] = borrower
-    save_data(data)
+    with get_db(immediate=True) as conn:
+        book = _get_book(conn, book_id)
+        
+        if not book:
+            print(f"Error: Book with ID {book_id} not found.")
+            return
+        
+        if not book['available']:
+            print(f"Error: Book '{book['title']}' is already borrowed.")
+            return
+        
+        conn.execute('UPDATE books SET available = 0, borrower = ? WHERE id = ?',
+                     (borrower, book_id))
     print(f"'{book['title']}' borrowed by {borrower}")
 
 def return_book(book_id):
     """Return a borrowed book to the library."""
-    data = load_data()
-    book = next((b for b in data['books'] if b['id'] == book_id), None)
-    
-    if not book:
-        print(f"Error: Book with ID {book_id} not found.")
-        return
-    
-    if book['available']:
-        print(f"Error: Book '{book['title']}' is already available.")
-        return
-    
-    borrower = data['borrowed'].pop(str(book_id), 'Unknown')
-    book['available'] = True
-    save_data(data)
-    print(f"'{book['title']}' returned by {borrower}")
+    with get_db(immediate=True) as conn:
+        book = _get_book(conn, book_id)
+        
+        if not book:
+            print(f"Error: Book with ID {book_id} not found.")
+            return
+        
+        if book['available']:
+            print(f"Error: Book '{book['title']}' is already available.")
+            return
+        
+        conn.execute('UPDATE books SET available = 1, borrower = NULL WHERE id = ?',
+                     (book_id,))
+    print(f"'{book['title']}' returned by {book['borrower'] or 'Unknown'}")
 
 def remove_book(book_id):
     """Remove a book from the library."""
-    data = load_data()
-    book = next((b for b in data['books'] if b['id'] == book_id), None)
-    
-    if not book:
-        print(f"Error: Book with ID {book_id} not found.")
-        return
-    
-    if not book['available']:
-        print(f"Error: Cannot remove '{book['title']}' - it is currently borrowed.")
-        return
-    
-    data['books'] = [b for b in data['books'] if b['id'] != book_id]
-    save_data(data)
+    with get_db(immediate=True) as conn:
+        book = _get_book(conn, book_id)
+        
+        if not book:
+            print(f"Error: Book with ID {book_id} not found.")
+            return
+        
+        if not book['available']:
+            print(f"Error: Cannot remove '{book['title']}' - it is currently borrowed.")
+            return
+        
+        conn.execute('DELETE FROM books WHERE id = ?', (book_id,))
     print(f"Removed book: '{book['title']}'")
 
 def search_books(query):
     """Search for books by title or author."""
-    data = load_data()
-    query_lower = query.lower()
-    matches = [
-        b for b in data['books']
-        if query_lower in b['title'].lower() or query_lower in b['author'].lower()
-    ]
+    matches = _connection().execute(
+        'SELECT * FROM books WHERE instr(search_key, ?) > 0 ORDER BY id',
+        (query.casefold(),)
+    ).fetchall()
     
     if not matches:
         print(f"No books found matching '{query}'")
@@ -180,6 +277,8 @@ Examples:
         parser.print_help()
         return
     
+    init_db()
+    
     if args.command == 'add':
         add_book(args.title, args.author, args.isbn)
     elif args.command == 'list':
@@ -3,11 +3,10 @@
 Minimal scheduler for managing time intervals and finding free slots.
 """
 
-from dataclasses import dataclass
-from typing import List, Tuple
+from bisect import bisect_left, bisect_right
+from typing import Iterator, List, NamedTuple
 
-@dataclass
-class Interval:
+class Interval(NamedTuple):
     """Time interval with start and end times."""
     start: int
     end: int
@@ -23,59 +22,62 @@ class Scheduler:
     """Minimal scheduler for managing intervals."""
     
     def __init__(self, day_start: int = 9, day_end: int = 17):
-        self.intervals: List[Interval] = []
+        # Parallel lists sorted by start; since intervals never overlap,
+        # ends are sorted too, which lets every lookup use bisect.
+        self.starts: List[int] = []
+        self.ends: List[int] = []
         self.day_start = day_start
         self.day_end = day_end
     
     def add(self, start: int, end: int) -> bool:
         """Add interval if it doesn't overlap with existing ones."""
-        new_interval = Interval(start, end)
-        
-        if new_interval.start >= new_interval.end:
+        if start >= end:
             return False
         
-        for existing in self.intervals:
-            if new_interval.overlaps(existing):
-                return False
+        i = bisect_left(self.starts, end)
+        if i > 0 and self.ends[i - 1] > start:
+            return False
         
-        self.intervals.append(new_interval)
-        self.intervals.sort(key=lambda x: x.start)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
         return True
     
     def remove(self, start: int, end: int) -> bool:
         """Remove matching interval."""
-        target = Interval(start, end)
-        for i, interval in enumerate(self.intervals):
-            if interval.start == target.start and interval.end == target.end:
-                self.intervals.pop(i)
-                return True
+        i = bisect_left(self.starts, start)
+        if i < len(self.starts) and self.starts[i] == start and self.ends[i] == end:
+            del self.starts[i]
+            del self.ends[i]
+            return True
         return False
     
-    def free_slots(self, min_duration: int = 1) -> List[Interval]:
-        """Find free time slots between scheduled intervals."""
-        free = []
+    def free_slots(self, min_duration: int = 1) -> Iterator[Interval]:
+        """Yield free time slots between scheduled intervals."""
         current = self.day_start
+        prev_end = None
         
-        for interval in sorted(self.intervals, key=lambda x: x.start):
-            if current < interval.start:
-                if interval.start - current >= min_duration:
-                    free.append(Interval(current, interval.start))
-            current = max(current, interval.end)
+        for start, end in zip(self.starts, self.ends):
+            # add() keeps intervals sorted and disjoint; no re-sort needed.
+            assert prev_end is None or start >= prev_end
+            prev_end = end
+            if current < start:
+                if start - current >= min_duration:
+                    yield Interval(current, start)
+            current = max(current, end)
         
         if current < self.day_end:
             if self.day_end - current >= min_duration:
-                free.append(Interval(current, self.day_end))
-        
-        return free
+                yield Interval(current, self.day_end)
     
     def list_all(self) -> List[Interval]:
         """List all scheduled intervals."""
-        return sorted(self.intervals, key=lambda x: x.start)
+        return [Interval(s, e) for s, e in zip(self.starts, self.ends)]
     
     def find_conflicts(self, start: int, end: int) -> List[Interval]:
         """Find intervals that conflict with given time."""
-        candidate = Interval(start, end)
-        return [iv for iv in self.intervals if candidate.overlaps(iv)]
+        lo = bisect_right(self.ends, start)
+        hi = bisect_left(self.starts, end)
+        return [Interval(self.starts[i], self.ends[i]) for i in range(lo, hi)]
 
 def main():
     """Example usage."""
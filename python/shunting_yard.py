@@ -4,18 +4,25 @@ Minimal Shunting Yard algorithm implementation.
 Converts infix notation to postfix (RPN) notation.
 """
 
+import re
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:  # optional JIT fast path
+    np = None
+
+_PREC = {'+': 1, '-': 1, '*': 2, '/': 2}
+
 def precedence(op):
     """Return precedence of operator (higher = more precedence)."""
-    if op in ('+', '-'):
-        return 1
-    if op in ('*', '/'):
-        return 2
-    return 0
+    return _PREC.get(op, 0)
 
 def shunting_yard(tokens):
     """Convert infix expression tokens to postfix (RPN) notation."""
     output = []
     operators = []
+    prec = _PREC.get
     
     for token in tokens:
         if token.isdigit():
@@ -26,9 +33,10 @@ def shunting_yard(tokens):
             while operators and operators[-1] != '(':
                 output.append(operators.pop())
             operators.pop()
-        elif token in '+-*/':
+        elif token in _PREC:
+            p_tok = prec(token)
             while (operators and operators[-1] != '(' and 
-                   precedence(operators[-1]) >= precedence(token)):
+                   prec(operators[-1], 0) >= p_tok):
                 output.append(operators.pop())
             operators.append(token)
     
@@ -56,21 +64,53 @@ def evaluate_rpn(tokens):
                 stack.append(a // b)
     return stack[0]
 
+# Operands are encoded as their (non-negative) value, operators as negative codes.
+_OP_CODES = {'+': -1, '-': -2, '*': -3, '/': -4}
+
+def encode_rpn(tokens):
+    """Encode RPN tokens as integer codes for evaluate_rpn_fast."""
+    codes = [_OP_CODES[t] if t in _OP_CODES else int(t) for t in tokens]
+    return np.array(codes, dtype=np.int64) if np is not None else codes
+
+def _rpn_eval(codes, stack):
+    sp = 0
+    for c in codes:
+        if c >= 0:
+            stack[sp] = c
+            sp += 1
+        else:
+            sp -= 1
+            b = stack[sp]
+            a = stack[sp - 1]
+            if c == -1:
+                stack[sp - 1] = a + b
+            elif c == -2:
+                stack[sp - 1] = a - b
+            elif c == -3:
+                stack[sp - 1] = a * b
+            else:
+                stack[sp - 1] = a // b
+    return stack[0]
+
+if np is not None:
+    _rpn_eval = njit(cache=True)(_rpn_eval)
+
+def evaluate_rpn_fast(codes):
+    """Evaluate encoded RPN (see encode_rpn), JIT-compiled when numba is available.
+
+    Meant for large batches of expressions; for one-off use evaluate_rpn is
+    cheaper since it skips encoding and compilation. The JIT path uses
+    int64 arithmetic, so results that overflow 64 bits wrap.
+    """
+    if np is not None:
+        return int(_rpn_eval(codes, np.empty(len(codes), dtype=np.int64)))
+    return _rpn_eval(codes, [0] * len(codes))
+
+_TOKEN_RE = re.compile(r'\d+|[()+\-*/]')
+
 def tokenize(expression):
     """Split expression into tokens (numbers and operators)."""
-    tokens = []
-    current = ''
-    for char in expression.replace(' ', ''):
-        if char.isdigit():
-            current += char
-        else:
-            if current:
-                tokens.append(current)
-                current = ''
-            tokens.append(char)
-    if current:
-        tokens.append(current)
-    return tokens
+    return _TOKEN_RE.findall(expression)
 
 def main():
     """Example usage."""